@@ -1,16 +1,25 @@
 import os
 import sys
 import time
-from typing import List, Tuple, Optional, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import atexit
+import shelve
+import argparse
+import unicodedata
+import functools
+import contextlib
+from typing import List, Tuple, Optional, Dict, Any, AsyncIterator, Awaitable
 from urllib.parse import urlparse, parse_qs
 
 import spotipy
+import spotipy.oauth2
 from spotipy.oauth2 import SpotifyClientCredentials
-import requests
+import aiohttp
+import orjson
 import jwt
-from tqdm import tqdm
-from ratelimit import limits, sleep_and_retry
+from tqdm.asyncio import tqdm
+from aiolimiter import AsyncLimiter
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from dotenv import load_dotenv
 from cryptography.hazmat.primitives import serialization
 
@@ -18,7 +27,7 @@ from cryptography.hazmat.primitives import serialization
 load_dotenv()
 
 # Type aliases
-SpotifyTrack = Tuple[str, str, str]  # (track_name, artist_name, album_name)
+SpotifyTrack = Tuple[str, str, str, Optional[str]]  # (track_name, artist_name, album_name, isrc)
 AppleMusicTrackID = str
 
 # API credentials
@@ -31,8 +40,46 @@ APPLE_MUSIC_USER_TOKEN: str = os.getenv('APPLE_MUSIC_USER_TOKEN', '')
 
 # Constants
 MAX_CONCURRENT_TASKS: int = 10
+SPOTIFY_PAGE_SIZE: int = 100  # Maximum tracks per Spotify playlist page
+PLAYLIST_BATCH_SIZE: int = 100  # Tracks sent per Apple Music playlist request
 SPOTIFY_RATE_LIMIT: Tuple[int, int] = (20, 1)  # 20 calls per 1 second
 APPLE_MUSIC_RATE_LIMIT: Tuple[int, int] = (20, 1)  # 20 calls per 1 second
+MAX_REQUEST_ATTEMPTS: int = 6  # Attempts per request when the API reports it is overloaded
+
+APPLE_MUSIC_TOKEN_LIFETIME: int = 15777000  # About six months, the maximum Apple allows
+APPLE_MUSIC_TOKEN_REFRESH_MARGIN: int = 600  # Mint a new token ten minutes before the cached one expires
+SEARCH_CACHE_PATH: str = os.getenv('SEARCH_CACHE_PATH', '.search_cache')
+SEARCH_CACHE_MISS_TTL: int = 7 * 24 * 60 * 60  # Retry tracks that were not found after a week
+NOT_FOUND: str = 'NOT_FOUND'
+
+# Search results keyed by normalized (track, artist, album, isrc), loaded once per run
+search_cache: Dict[str, Tuple[AppleMusicTrackID, float]] = {}
+
+# Searches currently running, so concurrent searches for the same track share one result
+inflight_searches: Dict[str, asyncio.Future] = {}
+
+# Token buckets shared by every request coroutine on the event loop
+spotify_limiter = AsyncLimiter(*SPOTIFY_RATE_LIMIT)
+apple_music_limiter = AsyncLimiter(*APPLE_MUSIC_RATE_LIMIT)
+
+# Monotonic time each rate limited API host asked us to wait until
+retry_after_deadlines: Dict[str, float] = {}
+
+class ConversionError(Exception):
+    """
+    Raised when a single playlist conversion fails and the remaining playlists can still be converted.
+    """
+
+class RateLimited(aiohttp.ClientError):
+    """
+    Raised when an API responds with a status the request retries on, such as 429 or 503.
+    
+    Attributes:
+        retry_after (Optional[float]): Seconds the server asked us to wait, if it said.
+    """
+    def __init__(self, status: int, retry_after: Optional[float]) -> None:
+        super().__init__(f"Rate limited (HTTP {status}), retry after {retry_after}s")
+        self.retry_after = retry_after
 
 def setup_credentials() -> None:
     """
@@ -79,19 +126,86 @@ def extract_playlist_id(playlist_url: str) -> str:
     
     raise ValueError("Could not extract playlist ID from the provided URL.")
 
-@sleep_and_retry
-@limits(calls=SPOTIFY_RATE_LIMIT[0], period=SPOTIFY_RATE_LIMIT[1])
-def get_spotify_tracks(playlist_id: str) -> Tuple[List[SpotifyTrack], str]:
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
     """
-    Fetch all tracks from a Spotify playlist.
+    Parse a Retry-After header given in seconds.
     
     Args:
-        playlist_id (str): The Spotify playlist ID.
+        value (Optional[str]): The header value.
+    
+    Returns:
+        Optional[float]: The number of seconds to wait, or None if absent or not a number.
+    """
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+_wait_backoff = wait_exponential_jitter(initial=1, max=60)
+
+def wait_for_retry(retry_state: Any) -> float:
+    """
+    Tenacity wait strategy honouring Retry-After, falling back to exponential backoff.
+    """
+    exception = retry_state.outcome.exception()
+    if isinstance(exception, RateLimited) and exception.retry_after is not None:
+        return exception.retry_after
+    return _wait_backoff(retry_state)
+
+@retry(
+    retry=retry_if_exception_type(RateLimited),
+    wait=wait_for_retry,
+    stop=stop_after_attempt(MAX_REQUEST_ATTEMPTS),
+    reraise=True
+)
+async def api_request(session: aiohttp.ClientSession, limiter: AsyncLimiter, method: str, url: str, retry_statuses: Tuple[int, ...] = (429, 503), **kwargs: Any) -> Any:
+    """
+    Send a rate limited API request, retrying when the server reports it is overloaded.
+    
+    When a host responds with a status in retry_statuses every request to that host waits
+    out the Retry-After period, so concurrent callers back off together instead of each
+    hitting the limit again.
+    
+    Args:
+        session (aiohttp.ClientSession): The HTTP session to issue requests with.
+        limiter (AsyncLimiter): The rate limiter for the API being called.
+        method (str): The HTTP method.
+        url (str): The request URL.
+        retry_statuses (Tuple[int, ...]): Statuses that are retried. Requests that are not safe
+            to repeat should only retry on 429, since a 503 may come after the server acted.
+        **kwargs: Passed through to aiohttp.ClientSession.request.
+    
+    Returns:
+        Any: The decoded JSON response, or None if the response has no content.
+    
+    Raises:
+        aiohttp.ClientError: If the request fails, including RateLimited once retries are exhausted.
+        asyncio.TimeoutError: If the request times out.
+    """
+    host = urlparse(url).netloc
+    delay = retry_after_deadlines.get(host, 0) - time.monotonic()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    
+    async with limiter:
+        async with session.request(method, url, **kwargs) as response:
+            if response.status in retry_statuses:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    deadline = time.monotonic() + retry_after
+                    retry_after_deadlines[host] = max(retry_after_deadlines.get(host, 0), deadline)
+                raise RateLimited(response.status, retry_after)
+            response.raise_for_status()
+            if response.status == 204:
+                return None
+            return orjson.loads(await response.read())
+
+def get_spotify_headers() -> Dict[str, str]:
+    """
+    Build the Spotify Web API authorization headers using client credentials.
     
     Returns:
-        Tuple[List[SpotifyTrack], str]: A tuple containing:
-            - A list of tuples containing track names, artist names, and album names.
-            - The name of the Spotify playlist.
+        Dict[str, str]: The request headers.
     
     Raises:
         SystemExit: If there's an error accessing the Spotify API.
@@ -101,26 +215,168 @@ def get_spotify_tracks(playlist_id: str) -> Tuple[List[SpotifyTrack], str]:
             client_id=SPOTIFY_CLIENT_ID,
             client_secret=SPOTIFY_CLIENT_SECRET
         )
-        sp = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
-        
-        playlist = sp.playlist(playlist_id)
-        playlist_name = playlist['name']
-        
-        results = sp.playlist_tracks(playlist_id)
-        tracks = results['items']
-        while results['next']:
-            results = sp.next(results)
-            tracks.extend(results['items'])
-        
-        return [(track['track']['name'], track['track']['artists'][0]['name'], track['track']['album']['name']) for track in tracks if track['track']], playlist_name
-    except spotipy.SpotifyException as e:
+        return {
+            'Authorization': f'Bearer {client_credentials_manager.get_access_token(as_dict=False)}'
+        }
+    except (spotipy.SpotifyException, spotipy.oauth2.SpotifyOauthError) as e:
         print(f"Error accessing Spotify API: {e}")
         sys.exit(1)
 
+async def get_spotify_playlist(session: aiohttp.ClientSession, playlist_id: str, headers: Dict[str, str]) -> Tuple[str, int]:
+    """
+    Fetch the name and track count of a Spotify playlist.
+    
+    Args:
+        session (aiohttp.ClientSession): The HTTP session to issue requests with.
+        playlist_id (str): The Spotify playlist ID.
+        headers (Dict[str, str]): The Spotify authorization headers.
+    
+    Returns:
+        Tuple[str, int]: The name of the Spotify playlist and its number of tracks.
+    
+    Raises:
+        ConversionError: If there's an error accessing the Spotify API.
+    """
+    url = f"https://api.spotify.com/v1/playlists/{playlist_id}"
+    try:
+        playlist = await api_request(session, spotify_limiter, 'GET', url, headers=headers, params={'fields': 'name,tracks.total'})
+        return playlist['name'], playlist['tracks']['total']
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise ConversionError(f"Error accessing Spotify API: {e}") from e
+
+async def get_spotify_tracks(session: aiohttp.ClientSession, playlist_id: str, total: int, headers: Dict[str, str]) -> AsyncIterator[SpotifyTrack]:
+    """
+    Stream the tracks of a Spotify playlist.
+    
+    Only the fields we use are requested and every page is fetched concurrently. Tracks are
+    yielded in playlist order as soon as their page arrives, so callers can start working
+    before the whole playlist has been downloaded.
+    
+    Args:
+        session (aiohttp.ClientSession): The HTTP session to issue requests with.
+        playlist_id (str): The Spotify playlist ID.
+        total (int): The number of tracks in the playlist.
+        headers (Dict[str, str]): The Spotify authorization headers.
+    
+    Yields:
+        SpotifyTrack: A tuple containing the track name, artist name, album name, and ISRC if Spotify has one.
+    
+    Raises:
+        ConversionError: If there's an error accessing the Spotify API.
+    """
+    url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks"
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
+    
+    async def fetch_page(offset: int) -> List[Dict[str, Any]]:
+        params = {
+            'offset': offset,
+            'limit': SPOTIFY_PAGE_SIZE,
+            'fields': 'items(track(name,artists(name),album(name),external_ids(isrc)))'
+        }
+        async with semaphore:
+            page = await api_request(session, spotify_limiter, 'GET', url, headers=headers, params=params)
+        return page['items']
+    
+    pages = [asyncio.create_task(fetch_page(offset)) for offset in range(0, total, SPOTIFY_PAGE_SIZE)]
+    try:
+        for page in pages:
+            for track in await page:
+                if track['track']:
+                    yield (
+                        track['track']['name'],
+                        track['track']['artists'][0]['name'],
+                        track['track']['album']['name'],
+                        (track['track'].get('external_ids') or {}).get('isrc')
+                    )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise ConversionError(f"Error accessing Spotify API: {e}") from e
+    finally:
+        for page in pages:
+            page.cancel()
+        # Retrieve any other failed pages so asyncio doesn't log their exceptions
+        await asyncio.gather(*pages, return_exceptions=True)
+
+def search_cache_key(track_name: str, artist_name: str, album_name: str, isrc: Optional[str]) -> str:
+    """
+    Build the key identifying a track for deduplication, the search cache and in-flight searches.
+    
+    Args:
+        track_name (str): The name of the track.
+        artist_name (str): The name of the artist.
+        album_name (str): The name of the album.
+        isrc (Optional[str]): The track's ISRC, if known.
+    
+    Returns:
+        str: The normalized cache key.
+    """
+    fields = (track_name, artist_name, album_name, isrc or '')
+    return '|'.join(unicodedata.normalize('NFKD', field).casefold() for field in fields)
+
+def load_search_cache(clear: bool = False) -> None:
+    """
+    Load the persistent search cache into memory and flush it back on exit.
+    
+    Args:
+        clear (bool): Discard any previously cached results.
+    """
+    with shelve.open(SEARCH_CACHE_PATH) as cache:
+        if clear:
+            cache.clear()
+        search_cache.update(cache)
+    atexit.register(save_search_cache)
+
+def save_search_cache() -> None:
+    """
+    Write the in-memory search cache to disk.
+    """
+    with shelve.open(SEARCH_CACHE_PATH) as cache:
+        cache.update(search_cache)
+
+@functools.lru_cache(maxsize=1)
+def load_private_key() -> Any:
+    """
+    Load the Apple Music private key.
+    
+    Parsing the PEM is comparatively expensive, so the key object is loaded once and reused.
+    
+    Returns:
+        Any: The private key object used to sign Apple Music tokens.
+    """
+    return serialization.load_pem_private_key(
+        APPLE_MUSIC_SECRET_KEY.encode(),
+        password=None
+    )
+
+@functools.lru_cache(maxsize=1)
+def mint_apple_music_token() -> Tuple[str, int]:
+    """
+    Sign a new Apple Music API token.
+    
+    The result is cached, so every caller in a run shares one token until
+    get_apple_music_token decides it needs replacing.
+    
+    Returns:
+        Tuple[str, int]: The token and its expiry as a Unix timestamp.
+    """
+    headers = {
+        'alg': 'ES256',
+        'kid': APPLE_MUSIC_KEY_ID
+    }
+    now = int(time.time())
+    exp = now + APPLE_MUSIC_TOKEN_LIFETIME
+    payload = {
+        'iss': APPLE_MUSIC_TEAM_ID,
+        'iat': now,
+        'exp': exp
+    }
+    return jwt.encode(payload, load_private_key(), algorithm='ES256', headers=headers), exp
+
 def get_apple_music_token() -> str:
     """
     Generate an Apple Music API token.
     
+    The token is cached and only regenerated when it is close to expiring.
+    
     Returns:
         str: The generated Apple Music API token.
     
@@ -128,79 +384,153 @@ def get_apple_music_token() -> str:
         SystemExit: If there's an error creating the Apple Music token.
     """
     try:
-        # Load the private key
-        private_key = serialization.load_pem_private_key(
-            APPLE_MUSIC_SECRET_KEY.encode(),
-            password=None
-        )
-
-        headers = {
-            'alg': 'ES256',
-            'kid': APPLE_MUSIC_KEY_ID
-        }
-        payload = {
-            'iss': APPLE_MUSIC_TEAM_ID,
-            'iat': int(time.time()),
-            'exp': int(time.time()) + 15777000
-        }
-        
-        token = jwt.encode(payload, private_key, algorithm='ES256', headers=headers)
+        token, expiry = mint_apple_music_token()
+        if time.time() > expiry - APPLE_MUSIC_TOKEN_REFRESH_MARGIN:
+            mint_apple_music_token.cache_clear()
+            token, expiry = mint_apple_music_token()
         return token
     except Exception as e:
         print(f"Error creating Apple Music token: {e}")
         sys.exit(1)
 
-@sleep_and_retry
-@limits(calls=APPLE_MUSIC_RATE_LIMIT[0], period=APPLE_MUSIC_RATE_LIMIT[1])
-def search_apple_music(track_name: str, artist_name: str, album_name: str, token: str) -> Optional[AppleMusicTrackID]:
+async def lookup_apple_music_isrc(session: aiohttp.ClientSession, headers: Dict[str, str], isrc: str) -> Optional[AppleMusicTrackID]:
     """
-    Search for a track on Apple Music. If no result is found, try searching again without the album name.
+    Look up a track in the Apple Music catalog by ISRC.
     
     Args:
-    track_name (str): The name of the track to search for.
-    artist_name (str): The name of the artist.
-    album_name (str): The name of the album.
-    token (str): The Apple Music API token.
+    session (aiohttp.ClientSession): The HTTP session to issue requests with.
+    headers (Dict[str, str]): The Apple Music authorization headers.
+    isrc (str): The track's ISRC.
+    
+    Returns:
+    Optional[AppleMusicTrackID]: The Apple Music track ID if found, None otherwise.
+    
+    Raises:
+    aiohttp.ClientError: If the request fails.
+    asyncio.TimeoutError: If the request times out.
+    """
+    url = "https://api.music.apple.com/v1/catalog/us/songs"
+    data = await api_request(session, apple_music_limiter, 'GET', url, headers=headers, params={'filter[isrc]': isrc})
+    if data['data']:
+        return data['data'][0]['id']
+    return None
+
+async def perform_apple_music_search(session: aiohttp.ClientSession, headers: Dict[str, str], search_term: str) -> Optional[AppleMusicTrackID]:
+    """
+    Search the Apple Music catalog for the best matching song.
+    
+    Args:
+    session (aiohttp.ClientSession): The HTTP session to issue requests with.
+    headers (Dict[str, str]): The Apple Music authorization headers.
+    search_term (str): The search term.
     
     Returns:
     Optional[AppleMusicTrackID]: The Apple Music track ID if found, None otherwise.
+    
+    Raises:
+    aiohttp.ClientError: If the request fails.
+    asyncio.TimeoutError: If the request times out.
     """
     url = "https://api.music.apple.com/v1/catalog/us/search"
-    headers = {
-        'Authorization': f'Bearer {token}'
+    params = {
+        'term': search_term,
+        'types': 'songs',
+        'limit': 1
     }
+    data = await api_request(session, apple_music_limiter, 'GET', url, headers=headers, params=params)
+    if 'songs' in data['results'] and data['results']['songs']['data']:
+        return data['results']['songs']['data'][0]['id']
+    return None
+
+async def search_apple_music(session: aiohttp.ClientSession, track_name: str, artist_name: str, album_name: str, isrc: Optional[str], headers: Dict[str, str]) -> Optional[AppleMusicTrackID]:
+    """
+    Search for a track on Apple Music, looking it up by ISRC first when one is given. If that finds
+    nothing, search by name with and without the album name, preferring the album-qualified match.
+    Results, including misses, are remembered in the search cache, and concurrent searches for the
+    same track wait for the one already running. Failed requests are raised rather than cached, so
+    the track is searched again on the next run.
     
-    def perform_search(search_term):
-        params = {
-            'term': search_term,
-            'types': 'songs',
-            'limit': 1
-        }
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            if 'songs' in data['results'] and data['results']['songs']['data']:
-                return data['results']['songs']['data'][0]['id']
-            return None
-        except requests.RequestException as e:
-            print(f"Error searching Apple Music: {e}")
+    Args:
+    session (aiohttp.ClientSession): The HTTP session to issue requests with.
+    track_name (str): The name of the track to search for.
+    artist_name (str): The name of the artist.
+    album_name (str): The name of the album.
+    isrc (Optional[str]): The track's ISRC, if known.
+    headers (Dict[str, str]): The Apple Music authorization headers, shared by every search.
+    
+    Returns:
+    Optional[AppleMusicTrackID]: The Apple Music track ID if found, None otherwise.
+    
+    Raises:
+    aiohttp.ClientError: If a request fails.
+    asyncio.TimeoutError: If a request times out.
+    """
+    key = search_cache_key(track_name, artist_name, album_name, isrc)
+    cached = search_cache.get(key)
+    if cached is not None:
+        track_id, cached_at = cached
+        if track_id != NOT_FOUND:
+            return track_id
+        if time.time() - cached_at < SEARCH_CACHE_MISS_TTL:
             return None
     
-    # First search with all information
-    result = perform_search(f"{track_name} {artist_name} {album_name}")
+    if key in inflight_searches:
+        # Shielded so cancelling one waiter doesn't cancel the search everyone else is waiting on
+        return await asyncio.shield(inflight_searches[key])
     
-    # If no result, try again without album name
-    if result is None:
-        result = perform_search(f"{track_name} {artist_name}")
+    future = asyncio.get_running_loop().create_future()
+    inflight_searches[key] = future
+    try:
+        result = await lookup_apple_music_isrc(session, headers, isrc) if isrc else None
+        
+        # Otherwise search with and without the album name at the same time, preferring the
+        # album-qualified hit, so a miss on the full search costs one round trip instead of two
+        if result is None:
+            album_result, short_result = await asyncio.gather(
+                perform_apple_music_search(session, headers, f"{track_name} {artist_name} {album_name}"),
+                perform_apple_music_search(session, headers, f"{track_name} {artist_name}")
+            )
+            result = album_result or short_result
+        
+        search_cache[key] = (result or NOT_FOUND, time.time())
+        if not future.done():
+            future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        if not future.done():
+            future.set_exception(e)
+            # Mark the exception as retrieved so asyncio doesn't log it when nobody was waiting
+            future.exception()
+        raise
+    finally:
+        del inflight_searches[key]
+
+def encode_track_data(track_ids: List[AppleMusicTrackID]) -> bytes:
+    """
+    Encode track IDs as the JSON resource list used by the Apple Music playlist endpoints.
+    
+    The JSON is assembled directly rather than building a dict per track and serializing it.
     
-    return result
+    Args:
+        track_ids (List[AppleMusicTrackID]): The Apple Music track IDs.
+    
+    Returns:
+        bytes: A JSON array of song resource identifiers.
+    """
+    return b'[%s]' % b','.join(b'{"id":%s,"type":"songs"}' % orjson.dumps(track_id) for track_id in track_ids)
 
-def create_apple_music_playlist(name: str, track_ids: List[AppleMusicTrackID], token: str) -> Dict[str, Any]:
+async def create_apple_music_playlist(session: aiohttp.ClientSession, name: str, track_ids: List[AppleMusicTrackID], token: str) -> Dict[str, Any]:
     """
     Create a new playlist on Apple Music.
     
+    The playlist is created with the first batch of tracks and the remaining tracks are
+    appended in batches of PLAYLIST_BATCH_SIZE, in order.
+    
     Args:
+        session (aiohttp.ClientSession): The HTTP session to issue requests with.
         name (str): The name of the new playlist.
         track_ids (List[AppleMusicTrackID]): A list of Apple Music track IDs to add to the playlist.
         token (str): The Apple Music API token.
@@ -209,7 +539,7 @@ def create_apple_music_playlist(name: str, track_ids: List[AppleMusicTrackID], t
         Dict[str, Any]: The JSON response from the Apple Music API.
     
     Raises:
-        SystemExit: If there's an error creating the Apple Music playlist.
+        ConversionError: If there's an error creating the Apple Music playlist.
     """
     url = "https://api.music.apple.com/v1/me/library/playlists"
     headers = {
@@ -217,29 +547,28 @@ def create_apple_music_playlist(name: str, track_ids: List[AppleMusicTrackID], t
         'Music-User-Token': APPLE_MUSIC_USER_TOKEN,
         'Content-Type': 'application/json'
     }
-    data = {
-        "attributes": {
-            "name": name
-        },
-        "relationships": {
-            "tracks": {
-                "data": [{"id": track_id, "type": "songs"} for track_id in track_ids]
-            }
-        }
-    }
+    batches = [track_ids[i:i + PLAYLIST_BATCH_SIZE] for i in range(0, len(track_ids), PLAYLIST_BATCH_SIZE)] or [[]]
+    data = b'{"attributes":{"name":%s},"relationships":{"tracks":{"data":%s}}}' % (orjson.dumps(name), encode_track_data(batches[0]))
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        print(f"Error creating Apple Music playlist: {e}")
-        sys.exit(1)
+        playlist = await api_request(session, apple_music_limiter, 'POST', url, retry_statuses=(429,), headers=headers, data=data)
+        
+        # Batches are appended one at a time so the playlist keeps the Spotify track order.
+        # These POSTs only retry on 429: a 503 may come after Apple created the playlist or
+        # appended the batch, and repeating it would duplicate them.
+        tracks_url = f"{url}/{playlist['data'][0]['id']}/tracks"
+        for batch in batches[1:]:
+            await api_request(session, apple_music_limiter, 'POST', tracks_url, retry_statuses=(429,), headers=headers, data=b'{"data":%s}' % encode_track_data(batch))
+        
+        return playlist
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise ConversionError(f"Error creating Apple Music playlist: {e}") from e
 
-def validate_apple_music_token(token: str) -> bool:
+async def validate_apple_music_token(session: aiohttp.ClientSession, token: str) -> bool:
     """
     Validate the Apple Music user token.
     
     Args:
+        session (aiohttp.ClientSession): The HTTP session to issue requests with.
         token (str): The Apple Music user token to validate.
     
     Returns:
@@ -251,88 +580,162 @@ def validate_apple_music_token(token: str) -> bool:
         'Music-User-Token': token
     }
     try:
-        response = requests.get(url, headers=headers)
-        return response.status_code == 200
-    except requests.RequestException:
+        await api_request(session, apple_music_limiter, 'GET', url, headers=headers)
+        return True
+    except (aiohttp.ClientError, asyncio.TimeoutError):
         return False
 
-def convert_playlist(spotify_playlist_url: str) -> Tuple[Dict[str, Any], int, int]:
+def create_session() -> aiohttp.ClientSession:
+    """
+    Create the HTTP session shared by every Spotify and Apple Music request.
+    
+    Returns:
+        aiohttp.ClientSession: A session whose connections are kept alive between requests.
+    """
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_TASKS, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector)
+
+async def convert_playlist(session: aiohttp.ClientSession, spotify_playlist_url: str, user_token_valid: Awaitable[bool]) -> Tuple[Dict[str, Any], int, int]:
     """
     Convert a Spotify playlist to an Apple Music playlist.
     
     Args:
+        session (aiohttp.ClientSession): The HTTP session to issue requests with.
         spotify_playlist_url (str): The URL of the Spotify playlist to convert.
+        user_token_valid (Awaitable[bool]): The Apple Music user token validation, which may still
+            be running. It is awaited before anything is written to the user's library.
     
     Returns:
         Tuple[Dict[str, Any], int, int]: A tuple containing:
             - The JSON response from creating the Apple Music playlist
             - The total number of tracks in the Spotify playlist
             - The number of tracks successfully transferred to Apple Music
+    
+    Raises:
+        ValueError: If the playlist URL is invalid or the Apple Music user token is rejected.
+        ConversionError: If there's an error accessing Spotify or creating the Apple Music playlist.
     """
     setup_credentials()
     spotify_playlist_id = extract_playlist_id(spotify_playlist_url)
-    spotify_tracks, spotify_playlist_name = get_spotify_tracks(spotify_playlist_id)
     apple_music_token = get_apple_music_token()
+    apple_music_headers = {
+        'Authorization': f'Bearer {apple_music_token}'
+    }
     
-    new_playlist_name = f"{spotify_playlist_name} (Converted by Tool)"
+    spotify_headers = await asyncio.to_thread(get_spotify_headers)
+    spotify_playlist_name, spotify_track_total = await get_spotify_playlist(session, spotify_playlist_id, spotify_headers)
     
-    apple_music_track_ids: List[Optional[AppleMusicTrackID]] = [None] * len(spotify_tracks)
-    not_found_tracks: List[SpotifyTrack] = []
+    new_playlist_name = f"{spotify_playlist_name} (Converted by Tool)"
     
-    print(f"Converting {len(spotify_tracks)} tracks...")
-    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TASKS) as executor:
-        future_to_index = {executor.submit(search_apple_music, track_name, artist_name, album_name, apple_music_token): i 
-                   for i, (track_name, artist_name, album_name) in enumerate(spotify_tracks)}
-
-        for future in tqdm(as_completed(future_to_index), total=len(future_to_index), unit="track"):
-            index = future_to_index[future]
-            track_name, artist_name, album_name = spotify_tracks[index]
+    # Search each distinct track once, then map the results back onto the playlist order
+    spotify_tracks: List[SpotifyTrack] = []
+    track_keys: List[str] = []
+    unique_tracks: Dict[str, SpotifyTrack] = {}
+    
+    results: Dict[str, Optional[AppleMusicTrackID]] = {}
+    
+    print(f"Converting {spotify_track_total} tracks...")
+    
+    # Tracks are searched while the remaining Spotify pages are still downloading
+    queue: asyncio.Queue = asyncio.Queue()
+    progress = tqdm(total=0, unit="track")
+    
+    async def produce_tracks() -> None:
+        async for track in get_spotify_tracks(session, spotify_playlist_id, spotify_track_total, spotify_headers):
+            key = search_cache_key(*track)
+            spotify_tracks.append(track)
+            track_keys.append(key)
+            if key not in unique_tracks:
+                unique_tracks[key] = track
+                progress.total += 1
+                progress.refresh()
+                queue.put_nowait(key)
+        for _ in range(MAX_CONCURRENT_TASKS):
+            queue.put_nowait(None)
+    
+    async def search_tracks() -> None:
+        while (key := await queue.get()) is not None:
+            track_name, artist_name, album_name, isrc = unique_tracks[key]
             try:
-                track_id = future.result()
-                if track_id:
-                    apple_music_track_ids[index] = track_id
-                else:
-                    not_found_tracks.append((track_name, artist_name, album_name))
+                results[key] = await search_apple_music(session, track_name, artist_name, album_name, isrc, apple_music_headers)
             except Exception as e:
                 print(f"Error processing track {track_name} by {artist_name}: {e}")
-                not_found_tracks.append((track_name, artist_name, album_name))
+                results[key] = None
+            progress.update(1)
+    
+    workers = [asyncio.create_task(search_tracks()) for _ in range(MAX_CONCURRENT_TASKS)]
+    try:
+        with progress:
+            await produce_tracks()
+            await asyncio.gather(*workers)
+    finally:
+        # If fetching the playlist failed, stop searching its tracks rather than leaving the
+        # workers running into the next conversion
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
     
-    # Remove None values from apple_music_track_ids
-    apple_music_track_ids = [track_id for track_id in apple_music_track_ids if track_id is not None]
+    apple_music_track_ids = [track_id for key in track_keys if (track_id := results[key])]
+    not_found_tracks = [track for key, track in unique_tracks.items() if not results[key]]
     
-    new_playlist = create_apple_music_playlist(new_playlist_name, apple_music_track_ids, apple_music_token)
+    if not await user_token_valid:
+        raise ValueError("Invalid Apple Music user token.")
+    
+    new_playlist = await create_apple_music_playlist(session, new_playlist_name, apple_music_track_ids, apple_music_token)
     
     print("\nTracks not found on Apple Music:")
-    for track_name, artist_name, album_name in not_found_tracks:
+    for track_name, artist_name, album_name, _ in not_found_tracks:
         print(f"- {track_name} by {artist_name} ({album_name})")
     
     return new_playlist, len(spotify_tracks), len(apple_music_track_ids)
 
-def main() -> None:
+async def main() -> None:
     """
     Main function to run the Spotify to Apple Music playlist converter.
+    
+    Every playlist given on the command line is converted in turn, sharing one HTTP session,
+    developer token and search cache. Without arguments the playlist URL is prompted for.
     """
+    parser = argparse.ArgumentParser(description="Spotify to Apple Music Playlist Converter")
+    parser.add_argument('playlist_urls', nargs='*', metavar='playlist_url', help="Spotify playlist URLs to convert")
+    parser.add_argument('--clear-cache', action='store_true', help="discard cached Apple Music search results")
+    args = parser.parse_args()
+    
     print("Spotify to Apple Music Playlist Converter")
     print("----------------------------------------")
     
     # Verify credentials before proceeding
     setup_credentials()
+    load_search_cache(clear=args.clear_cache)
     
-    # Validate Apple Music user token
-    if not validate_apple_music_token(APPLE_MUSIC_USER_TOKEN):
-        print("Error: Invalid Apple Music user token. Please check your APPLE_MUSIC_USER_TOKEN in the .env file.")
-        sys.exit(1)
-    
-    spotify_playlist_url = input("Enter Spotify playlist URL: ")
-    
-    try:
-        result, total_tracks, transferred_tracks = convert_playlist(spotify_playlist_url)
-        print(f"\nNew Apple Music playlist created: {result['data'][0]['attributes']['name']}")
-        print(f"Transferred {transferred_tracks} out of {total_tracks} tracks")
-        print(f"Success rate: {transferred_tracks/total_tracks:.2%}")
-    except ValueError as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+    async with create_session() as session:
+        # Validate the Apple Music user token while the first playlist is fetched and searched
+        user_token_valid = asyncio.create_task(validate_apple_music_token(session, APPLE_MUSIC_USER_TOKEN))
+        
+        spotify_playlist_urls = args.playlist_urls or [await asyncio.to_thread(input, "Enter Spotify playlist URL: ")]
+        failed = False
+        
+        for spotify_playlist_url in spotify_playlist_urls:
+            conversion = asyncio.create_task(convert_playlist(session, spotify_playlist_url, user_token_valid))
+            if not await user_token_valid:
+                conversion.cancel()
+                with contextlib.suppress(asyncio.CancelledError, ValueError, ConversionError):
+                    await conversion
+                print("Error: Invalid Apple Music user token. Please check your APPLE_MUSIC_USER_TOKEN in the .env file.")
+                sys.exit(1)
+            
+            try:
+                result, total_tracks, transferred_tracks = await conversion
+                print(f"\nNew Apple Music playlist created: {result['data'][0]['attributes']['name']}")
+                print(f"Transferred {transferred_tracks} out of {total_tracks} tracks")
+                if total_tracks:
+                    print(f"Success rate: {transferred_tracks/total_tracks:.2%}")
+            except (ValueError, ConversionError) as e:
+                print(f"Error: {e}")
+                failed = True
+        
+        if failed:
+            sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file